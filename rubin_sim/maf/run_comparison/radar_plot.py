@@ -115,10 +115,15 @@ def _radar_factory(num_vars, frame="circle"):
         def _close_line(self, line):
             x, y = line.get_data()
             # FIXME: markers at x[0], y[0] get doubled-up
-            if x[0] != x[-1]:
-                x = np.concatenate((x, [x[0]]))
-                y = np.concatenate((y, [y[0]]))
-                line.set_data(x, y)
+            if float(x[0]) != float(x[-1]):
+                n = len(x)
+                x_closed = np.empty(n + 1)
+                x_closed[:n] = x
+                x_closed[n] = x[0]
+                y_closed = np.empty(n + 1)
+                y_closed[:n] = y
+                y_closed[n] = y[0]
+                line.set_data(x_closed, y_closed)
 
         def set_varlabels(self, labels):
             self.set_thetagrids(np.degrees(theta), labels)
@@ -136,7 +141,7 @@ def _radar_factory(num_vars, frame="circle"):
             spine_type = "circle"
             verts = _unit_poly_verts(theta)
             # close off polygon by repeating first vertex
-            verts.append(verts[0])
+            verts = np.vstack([verts, verts[:1]])
             path = Path(verts)
 
             spine = Spine(self, spine_type, path)
@@ -150,10 +155,11 @@ def _radar_factory(num_vars, frame="circle"):
 def _unit_poly_verts(theta):
     """Return vertices of polygon for subplot axes.
 
-    This polygon is circumscribed by a unit circle centered at (0.5, 0.5)
+    This polygon is circumscribed by a unit circle centered at (0.5, 0.5).
+    Returns an (N, 2) array of x, y vertices.
     """
     x0, y0, r = [0.5] * 3
-    verts = [(r * np.cos(t) + x0, r * np.sin(t) + y0) for t in theta]
+    verts = np.column_stack((r * np.cos(theta) + x0, r * np.sin(theta) + y0))
     return verts
 
 
@@ -177,12 +183,12 @@ def radar(
 
     if colors is None:
         colors = [None for i in range(len(df))]
-    ix = 0
-    for i, row in df.iterrows():
-        axes.plot(theta, row.values, "o-", label=i, color=colors[ix])
+    values = df.to_numpy()
+    labels = df.index.to_numpy()
+    for ix in range(len(values)):
+        axes.plot(theta, values[ix], "o-", label=labels[ix], color=colors[ix])
         if fill:
-            axes.fill(theta, row.values, alpha=alpha)
-        ix += 1
+            axes.fill(theta, values[ix], alpha=alpha)
 
     variables = df.columns.values
 
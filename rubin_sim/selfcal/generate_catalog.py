@@ -49,7 +49,7 @@ def build_tree(ra, dec, leafsize=100):
     if np.any(np.abs(ra) > np.pi * 2.0) or np.any(np.abs(dec) > np.pi * 2.0):
         raise ValueError("Expecting RA and Dec values to be in radians.")
     x, y, z = treexyz(ra, dec)
-    data = list(zip(x, y, z))
+    data = np.column_stack((x, y, z))
     if np.size(data) > 0:
         star_tree = kdtree(data, leafsize=leafsize)
     else:
@@ -1,8 +1,10 @@
 __all__ = ("LsqrSolver",)
 
+import warnings
+
 import numpy as np
 from scipy.sparse import coo_matrix
-from scipy.sparse.linalg import lsqr
+from scipy.sparse.linalg import LinearOperator, lsmr
 
 # Modified from /astro/store/scratch/tmp/yoachim/Research/LSST/Parallel_Solver
 # and then from https://github.com/lsst-sims/legacy_sims_selfcal
@@ -12,19 +14,30 @@ class LsqrSolver:
     """
     Class to solve self-calibration
 
+    The fit only constrains zeropoints and star magnitudes up to a constant
+    (added to every zeropoint and subtracted from every star magnitude).
+    The solution is shifted so that the median patch zeropoint is zero.
+
     Parameters
     ----------
     observations : `np.array`
         A numpy array of the observations.
         Should have columns id, patch_id, observed_mag, mag_uncert.
     atol : `float`
-        Tolerance passed to lsqr.
+        Tolerance passed to lsmr. Note the tolerances apply to the
+        column-scaled (preconditioned) system.
     btol : `float`
-        Tolerance passed to lsqr.
+        Tolerance passed to lsmr.
     iter_lim : `int`
-        Iteration limit passed to lsqr.
+        Iteration limit passed to lsmr (as maxiter).
     show : `bool`
-        Should the lsqr solver print some iteration logs (False).
+        Should the lsmr solver print some iteration logs (False).
+    x0 : `tuple` of `np.array`, opt
+        Initial guess for the solution, as the (patches, stars) arrays
+        returned by `return_solution` of a previous, similar run.
+        Values are matched on patch_id and id, with zero used for
+        patches and stars not in x0. Ignored (with a warning) if no
+        patches or stars match. Default None starts from zero.
     """
 
     def __init__(
@@ -34,16 +47,26 @@ class LsqrSolver:
         btol=1e-8,
         iter_lim=None,
         show=False,
+        x0=None,
     ):
         self.atol = atol
         self.btol = btol
         self.iter_lim = iter_lim
         self.observations = observations
         self.show = show
+        self.x0 = x0
 
     def run(self):
         """clean data, solve matrix, write solution out."""
         self.clean_data()
+        if self.n_patches == 0:
+            # Nothing left that can constrain a fit, skip the solver
+            warnings.warn("No observations left after cleaning, returning empty solution")
+            del self.observations
+            # Same layout as the lsmr output
+            # (x, istop, itn, normr, normar, norma, conda, normx)
+            self.solution = (np.zeros(0), 0, 0, 0.0, 0.0, 0.0, np.nan, 0.0)
+            return
         self.solve_matrix()
 
     def clean_data(self):
@@ -122,8 +145,64 @@ class LsqrSolver:
 
         A = coo_matrix((data, (row, col)), shape=(n_obs, self.n_patches + self.n_stars))
         A = A.tocsr()
-        # solve Ax = b
-        self.solution = lsqr(A, b, show=self.show, atol=self.atol, btol=self.btol, iter_lim=self.iter_lim)
+        # Patch and star columns have very different norms, so scale
+        # each column to unit norm (Jacobi preconditioning) and
+        # solve A D y = b, then x = D y.
+        col_norms = np.sqrt(np.asarray(A.multiply(A).sum(axis=0)).ravel())
+        D = 1.0 / np.where(col_norms > 0, col_norms, 1.0)
+        AD = LinearOperator(
+            A.shape,
+            matvec=lambda y: A @ (D * y),
+            rmatvec=lambda r: D * (A.T @ r),
+            dtype=A.dtype,
+        )
+        x0 = self._initial_guess()
+        if x0 is not None:
+            # Warm start from x0, expressed in the scaled y = x / D space
+            x0 = x0 / D
+        # solve Ax = b. lsmr only needs A*x and A^T*y products, and
+        # tends to stop earlier than lsqr on this kind of system.
+        solution = lsmr(
+            AD,
+            b,
+            show=self.show,
+            atol=self.atol,
+            btol=self.btol,
+            maxiter=self.iter_lim,
+            x0=x0,
+        )
+        x = D * solution[0]
+        # Fix the arbitrary constant offset, median patch zeropoint of zero
+        offset = np.median(x[0 : self.n_patches])
+        x[0 : self.n_patches] -= offset
+        x[self.n_patches :] += offset
+        self.solution = (x,) + solution[1:]
+
+    def _initial_guess(self):
+        """Map x0 onto the columns of the cleaned system.
+
+        Returns
+        -------
+        x0 : `np.array` or None
+            Patch zeropoints followed by star magnitudes, or None if
+            there is no usable initial guess.
+        """
+        if self.x0 is None:
+            return None
+        patches, stars = self.x0
+        _, patch_cols, patch_indx = np.intersect1d(
+            self.patches, patches["patch_id"], assume_unique=True, return_indices=True
+        )
+        _, star_cols, star_indx = np.intersect1d(
+            self.stars, stars["id"], assume_unique=True, return_indices=True
+        )
+        if patch_cols.size == 0 and star_cols.size == 0:
+            warnings.warn("x0 does not match any patches or stars, ignoring it")
+            return None
+        x0 = np.zeros(self.n_patches + self.n_stars)
+        x0[patch_cols] = patches["zp"][patch_indx]
+        x0[self.n_patches + star_cols] = stars["fit_mag"][star_indx]
+        return x0
 
     def return_solution(self):
         """
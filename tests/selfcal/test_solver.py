@@ -0,0 +1,106 @@
+import unittest
+
+import numpy as np
+
+from rubin_sim.selfcal import LsqrSolver
+
+
+def make_observations(n_stars=200, n_patches=20, n_obs_per_star=6, seed=42):
+    """Make a noise-free catalog of observations with known zeropoints.
+
+    Returns
+    -------
+    observations, true_zp, true_mag : `np.array`, `np.array`, `np.array`
+        The observations, the true zeropoint of each patch and the
+        true magnitude of each star (indexed by patch_id and id).
+    """
+    rng = np.random.default_rng(seed)
+    true_zp = rng.normal(0.0, 0.1, n_patches)
+    true_mag = rng.uniform(16.0, 22.0, n_stars)
+
+    names = ["id", "patch_id", "observed_mag", "mag_uncert"]
+    types = [int, int, float, float]
+    observations = np.zeros(n_stars * n_obs_per_star, dtype=list(zip(names, types)))
+    observations["id"] = np.repeat(np.arange(n_stars), n_obs_per_star)
+    observations["patch_id"] = rng.integers(0, n_patches, observations.size)
+    observations["mag_uncert"] = rng.uniform(0.005, 0.05, observations.size)
+    observations["observed_mag"] = true_mag[observations["id"]] + true_zp[observations["patch_id"]]
+    return observations, true_zp, true_mag
+
+
+class TestLsqrSolver(unittest.TestCase):
+    def test_recover_zeropoints(self):
+        """Test the solver recovers known zeropoints up to a constant offset."""
+        observations, true_zp, true_mag = make_observations()
+        solver = LsqrSolver(observations)
+        solver.run()
+        patches, stars = solver.return_solution()
+
+        self.assertEqual(patches.size, true_zp.size)
+        self.assertEqual(stars.size, true_mag.size)
+        self.assertAlmostEqual(np.median(patches["zp"]), 0.0)
+        # The fit is only defined up to a constant added to every zeropoint
+        # and subtracted from every star magnitude.
+        offset = np.mean(patches["zp"] - true_zp[patches["patch_id"]])
+        np.testing.assert_allclose(patches["zp"] - offset, true_zp[patches["patch_id"]], atol=1e-5)
+        np.testing.assert_allclose(stars["fit_mag"] + offset, true_mag[stars["id"]], atol=1e-5)
+
+    def test_warm_start(self):
+        """Test a warm start converges to the same solution as a cold start."""
+        observations, true_zp, true_mag = make_observations()
+        solver = LsqrSolver(observations.copy())
+        solver.run()
+        cold_patches, cold_stars = solver.return_solution()
+
+        # Perturbed initial guess with an extra constant offset,
+        # and some stars missing
+        rng = np.random.default_rng(7)
+        x0_patches = cold_patches.copy()
+        x0_patches["zp"] += 0.5 + rng.normal(0.0, 0.01, x0_patches.size)
+        x0_stars = cold_stars[::2].copy()
+        x0_stars["fit_mag"] -= 0.5
+        solver = LsqrSolver(observations.copy(), x0=(x0_patches, x0_stars))
+        solver.run()
+        warm_patches, warm_stars = solver.return_solution()
+
+        np.testing.assert_array_equal(warm_patches["patch_id"], cold_patches["patch_id"])
+        np.testing.assert_array_equal(warm_stars["id"], cold_stars["id"])
+        np.testing.assert_allclose(warm_patches["zp"], cold_patches["zp"], atol=1e-5)
+        np.testing.assert_allclose(warm_stars["fit_mag"], cold_stars["fit_mag"], atol=1e-5)
+
+    def test_mismatched_x0(self):
+        """Test an x0 from a different catalog is ignored with a warning."""
+        observations, true_zp, true_mag = make_observations()
+        solver = LsqrSolver(observations.copy())
+        solver.run()
+        cold_patches, cold_stars = solver.return_solution()
+
+        # Solution of a different, smaller catalog with no ids in common
+        other, _, _ = make_observations(n_stars=50, n_patches=5, seed=3)
+        other["id"] += 10000
+        other["patch_id"] += 1000
+        solver = LsqrSolver(other)
+        solver.run()
+        x0 = solver.return_solution()
+
+        solver = LsqrSolver(observations.copy(), x0=x0)
+        with self.assertWarns(UserWarning):
+            solver.run()
+        patches, stars = solver.return_solution()
+        np.testing.assert_allclose(patches["zp"], cold_patches["zp"])
+        np.testing.assert_allclose(stars["fit_mag"], cold_stars["fit_mag"])
+
+    def test_empty_after_cleaning(self):
+        """Test observations that clean down to nothing give an empty solution."""
+        observations, _, _ = make_observations(n_obs_per_star=1)
+        solver = LsqrSolver(observations)
+        with self.assertWarns(UserWarning):
+            solver.run()
+        patches, stars = solver.return_solution()
+        self.assertEqual(patches.size, 0)
+        self.assertEqual(stars.size, 0)
+        self.assertEqual(len(solver.solution), 8)
+
+
+if __name__ == "__main__":
+    unittest.main()